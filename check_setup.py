@@ -47,14 +47,24 @@ def check_postgresql():
     print(f"✅ PostgreSQL is installed: {stdout.strip()}")
     return True
 
-def check_database_connection():
-    """Check if the database connection is working."""
-    # Try to import Django settings
-    try:
+# Set once Django has been configured, so the checks share a single bootstrap
+_django_ready = False
+
+def setup_django():
+    """Configure Django for the checks that need the ORM."""
+    global _django_ready
+    if not _django_ready:
         sys.path.insert(0, os.getcwd())
         os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'waap_project.settings')
         import django
         django.setup()
+        _django_ready = True
+
+def check_database_connection():
+    """Check if the database connection is working."""
+    # Try to import Django settings
+    try:
+        setup_django()
         
         from django.db import connections
         from django.db.utils import OperationalError
@@ -73,12 +83,18 @@ def check_database_connection():
 
 def check_migrations():
     """Check if migrations have been applied."""
-    stdout, stderr, success = run_command("python manage.py showmigrations")
-    if not success:
-        print("❌ Failed to check migrations.")
+    try:
+        setup_django()
+        
+        from django.db import connection
+        from django.db.migrations.executor import MigrationExecutor
+        
+        applied_migrations = MigrationExecutor(connection).loader.applied_migrations
+    except Exception as e:
+        print(f"❌ Failed to check migrations: {e}")
         return False
     
-    if "[X]" in stdout:
+    if applied_migrations:
         print("✅ Some migrations have been applied.")
         return True
     else:
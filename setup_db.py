@@ -5,27 +5,92 @@ This script helps create the PostgreSQL database and apply migrations.
 
 import os
 import sys
+import shlex
 import subprocess
+import tempfile
 import getpass
+import pprint
 
-def run_command(command):
-    """Run a shell command and print the output."""
-    print(f"Running: {command}")
-    result = subprocess.run(command, shell=True, capture_output=True, text=True)
-    if result.stdout:
-        print(result.stdout)
-    if result.stderr:
-        print(f"Error: {result.stderr}")
-    return result.returncode == 0
+class ShellRunner:
+    """Run commands through a single persistent shell session."""
+    
+    SENTINEL = "__DONE__:"
+    
+    def __init__(self):
+        self.process = subprocess.Popen(
+            ["/bin/sh"], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+        )
+        # Each command's stderr is redirected here so the stdout pipe can't deadlock on it
+        fd, self.stderr_path = tempfile.mkstemp(prefix="waap_setup_", suffix=".err")
+        os.close(fd)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def run(self, argv, interactive=False):
+        """Run an argv list in the shared shell and return (stdout, stderr, returncode)."""
+        # Quote every argument so user-supplied values are never interpreted by the shell
+        command = shlex.join(argv)
+        if interactive:
+            # Attach the command to the terminal so the user can answer its prompts
+            redirects = "</dev/tty >/dev/tty 2>&1"
+        else:
+            redirects = f"</dev/null 2>{shlex.quote(self.stderr_path)}"
+        
+        # The sentinel line marks the end of the command's output and carries its exit code
+        self.process.stdin.write(f"{command} {redirects}; printf '\\n{self.SENTINEL}%d\\n' \"$?\"\n")
+        self.process.stdin.flush()
+        
+        lines = []
+        returncode = -1
+        for line in self.process.stdout:
+            if line.startswith(self.SENTINEL):
+                returncode = int(line[len(self.SENTINEL):])
+                break
+            lines.append(line)
+        # Drop the newline printed ahead of the sentinel
+        stdout = "".join(lines)[:-1]
+        
+        stderr = ""
+        if not interactive:
+            with open(self.stderr_path) as f:
+                stderr = f.read()
+        
+        return stdout, stderr, returncode
+    
+    def close(self):
+        """Terminate the shell session and remove the stderr file."""
+        self.process.stdin.close()
+        self.process.wait()
+        os.remove(self.stderr_path)
+
+def run_command(shell, argv, interactive=False):
+    """Run an argv list in the shared shell and print the output."""
+    print(f"Running: {shlex.join(argv)}")
+    stdout, stderr, returncode = shell.run(argv, interactive=interactive)
+    if stdout:
+        print(stdout)
+    if stderr:
+        print(f"Error: {stderr}")
+    return returncode == 0
 
 def setup_database():
     """Set up the PostgreSQL database for the WAAP project."""
+    # All commands share one shell instead of spawning a new one per command
+    with ShellRunner() as shell:
+        return _setup_database(shell)
+
+def _setup_database(shell):
+    """Run the setup steps using the given shell session."""
     print("=" * 50)
     print("WAAP Project Database Setup")
     print("=" * 50)
     
     # Check if PostgreSQL is installed
-    if not run_command("psql --version"):
+    if not run_command(shell, ["psql", "--version"]):
         print("PostgreSQL is not installed or not in PATH. Please install PostgreSQL first.")
         return False
     
@@ -38,56 +103,53 @@ def setup_database():
     
     # Create database
     print("\nCreating database...")
-    create_db_command = f'psql -U {db_user} -h {db_host} -p {db_port} -c "CREATE DATABASE {db_name};"'
-    if not run_command(create_db_command):
+    create_db_command = ["psql", "-U", db_user, "-h", db_host, "-p", db_port, "-c", f"CREATE DATABASE {db_name};"]
+    if not run_command(shell, create_db_command):
         print("Failed to create database. Make sure PostgreSQL is running and credentials are correct.")
         return False
     
-    # Update settings.py with the provided credentials
-    print("\nUpdating settings.py...")
-    settings_path = os.path.join("waap_project", "settings.py")
+    # Write the credentials to local_db.py, which settings.py imports over its defaults
+    print("\nWriting database settings...")
+    local_db_path = os.path.join("waap_project", "local_db.py")
     
     try:
-        with open(settings_path, 'r') as f:
-            settings_content = f.read()
-        
-        # Replace database settings
-        import re
-        db_pattern = r'DATABASES = \{.*?\'default\': \{.*?\}.*?\}'
-        db_replacement = f'''DATABASES = {{
-    "default": {{
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": "{db_name}",
-        "USER": "{db_user}",
-        "PASSWORD": "{db_password}",
-        "HOST": "{db_host}",
-        "PORT": "{db_port}",
-    }}
-}}'''
-        
-        updated_settings = re.sub(db_pattern, db_replacement, settings_content, flags=re.DOTALL)
+        databases = {
+            "default": {
+                "ENGINE": "django.db.backends.postgresql",
+                "NAME": db_name,
+                "USER": db_user,
+                "PASSWORD": db_password,
+                "HOST": db_host,
+                "PORT": db_port,
+            }
+        }
+        # pformat writes Python literals, so quotes or backslashes in a value can't break the file
+        db_settings = (
+            '"""Local database settings, generated by setup_db.py."""\n\n'
+            f"DATABASES = {pprint.pformat(databases)}\n"
+        )
         
-        with open(settings_path, 'w') as f:
-            f.write(updated_settings)
+        with open(local_db_path, 'w') as f:
+            f.write(db_settings)
             
-        print("Settings updated successfully.")
+        print(f"Database settings written to {local_db_path}.")
     except Exception as e:
-        print(f"Failed to update settings: {e}")
+        print(f"Failed to write database settings: {e}")
         return False
     
     # Apply migrations
     print("\nApplying migrations...")
-    if not run_command("python manage.py makemigrations"):
+    if not run_command(shell, [sys.executable, "manage.py", "makemigrations"]):
         print("Failed to make migrations.")
         return False
     
-    if not run_command("python manage.py migrate"):
+    if not run_command(shell, [sys.executable, "manage.py", "migrate"]):
         print("Failed to apply migrations.")
         return False
     
     # Create superuser
     print("\nCreating superuser...")
-    if not run_command("python manage.py createsuperuser"):
+    if not run_command(shell, [sys.executable, "manage.py", "createsuperuser"], interactive=True):
         print("Failed to create superuser.")
         return False
     
@@ -5,7 +5,9 @@ from django.http import HttpResponseRedirect
 from django.urls import reverse
 from django.contrib.admin.models import LogEntry, CHANGE
 from django.contrib.contenttypes.models import ContentType
-from .models import WaapUser, Department, JobPosting, ContactMessage
+from django.db.models import BooleanField, Case, When
+from django.db.models.functions import Now
+from .models import WaapUser, Department, JobPosting, ContactMessage, bump_public_postings_version
 
 @admin.register(WaapUser)
 class WaapUserAdmin(admin.ModelAdmin):
@@ -31,6 +33,8 @@ class ContactMessageAdmin(admin.ModelAdmin):
     list_filter = ('is_sent', 'created_at')
     search_fields = ('sender_name', 'message')
     readonly_fields = ('sender_name', 'sender_email', 'sender_email_hash', 'job_posting', 'message', 'created_at', 'is_sent')
+    # The job posting column renders "title - department", so join both in the changelist query
+    list_select_related = ('job_posting__department',)
     
     def has_add_permission(self, request):
         return False
@@ -49,6 +53,11 @@ class JobPostingAdmin(admin.ModelAdmin):
     search_fields = ('job_title', 'location', 'moderation_notes')
     readonly_fields = ('posting_date', 'created_at', 'updated_at', 'moderation_date', 'moderation_by')
     actions = ['mark_as_inappropriate', 'flag_for_review', 'approve_posting', 'remove_posting']
+    # Newest first, served in index order by jp_recent_idx (-posting_date, moderation_status)
+    ordering = ('-posting_date',)
+    list_per_page = 50
+    # Skip the unfiltered COUNT(*) the changelist otherwise runs alongside the filtered one
+    show_full_result_count = False
     
     fieldsets = (
         ('Job Information', {
@@ -72,17 +81,24 @@ class JobPostingAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         """Override to show all job postings, including expired or flagged entries."""
         qs = super().get_queryset(request)
-        return qs
+        # Join the foreign keys used by list_display and __str__ so rows don't each
+        # trigger a query on the changelist or in the bulk actions
+        qs = qs.select_related('department', 'classification')
+        # Compute the Active column in the database so it is also sortable
+        return qs.annotate(_is_active=Case(
+            When(expiration_date__gte=Now(), then=True),
+            default=False,
+            output_field=BooleanField(),
+        ))
     
     def is_active(self, obj):
-        return obj.is_active
+        return obj._is_active
     is_active.boolean = True
     is_active.short_description = "Active"
+    is_active.admin_order_field = '_is_active'
     
     def creator_display(self, obj):
-        if obj.creator:
-            return f"{obj.creator.first_name} {obj.creator.last_name}"
-        return "Unknown"
+        return obj.creator_name or "Unknown"
     creator_display.short_description = "Creator"
     
     def save_model(self, request, obj, form, change):
@@ -105,24 +121,37 @@ class JobPostingAdmin(admin.ModelAdmin):
         
         super().save_model(request, obj, form, change)
     
+    def log_bulk_change(self, request, queryset, change_message):
+        """Record a change log entry for each selected job posting in a single INSERT."""
+        content_type_id = ContentType.objects.get_for_model(JobPosting).pk
+        # Fetch only what the log needs; object_repr matches JobPosting.__str__
+        rows = queryset.values_list('pk', 'job_title', 'department__name')
+        LogEntry.objects.bulk_create([
+            LogEntry(
+                user_id=request.user.id,
+                content_type_id=content_type_id,
+                object_id=str(pk),
+                object_repr=f"{job_title} - {department_name}"[:200],
+                action_flag=CHANGE,
+                change_message=change_message
+            )
+            for pk, job_title, department_name in rows
+        ], batch_size=5000)
+    
     def mark_as_inappropriate(self, request, queryset):
         """Mark selected job postings as inappropriate."""
         updated = queryset.update(
             moderation_status='INAPPROPRIATE',
             moderation_date=timezone.now(),
-            moderation_by=request.user.username
+            moderation_by=request.user.username,
+            updated_at=Now()
         )
         
         # Log the action for each object
-        for obj in queryset:
-            LogEntry.objects.log_action(
-                user_id=request.user.id,
-                content_type_id=ContentType.objects.get_for_model(obj).pk,
-                object_id=obj.pk,
-                object_repr=str(obj),
-                action_flag=CHANGE,
-                change_message="Marked as inappropriate via admin action"
-            )
+        self.log_bulk_change(request, queryset, "Marked as inappropriate via admin action")
+        
+        # Bulk updates bypass save(), so invalidate cached public pages here
+        bump_public_postings_version()
         
         self.message_user(request, f"{updated} job postings marked as inappropriate.")
     mark_as_inappropriate.short_description = "Mark selected postings as inappropriate"
@@ -132,19 +161,15 @@ class JobPostingAdmin(admin.ModelAdmin):
         updated = queryset.update(
             moderation_status='FLAGGED',
             moderation_date=timezone.now(),
-            moderation_by=request.user.username
+            moderation_by=request.user.username,
+            updated_at=Now()
         )
         
         # Log the action for each object
-        for obj in queryset:
-            LogEntry.objects.log_action(
-                user_id=request.user.id,
-                content_type_id=ContentType.objects.get_for_model(obj).pk,
-                object_id=obj.pk,
-                object_repr=str(obj),
-                action_flag=CHANGE,
-                change_message="Flagged for review via admin action"
-            )
+        self.log_bulk_change(request, queryset, "Flagged for review via admin action")
+        
+        # Bulk updates bypass save(), so invalidate cached public pages here
+        bump_public_postings_version()
         
         self.message_user(request, f"{updated} job postings flagged for review.")
     flag_for_review.short_description = "Flag selected postings for review"
@@ -154,19 +179,15 @@ class JobPostingAdmin(admin.ModelAdmin):
         updated = queryset.update(
             moderation_status='APPROVED',
             moderation_date=timezone.now(),
-            moderation_by=request.user.username
+            moderation_by=request.user.username,
+            updated_at=Now()
         )
         
         # Log the action for each object
-        for obj in queryset:
-            LogEntry.objects.log_action(
-                user_id=request.user.id,
-                content_type_id=ContentType.objects.get_for_model(obj).pk,
-                object_id=obj.pk,
-                object_repr=str(obj),
-                action_flag=CHANGE,
-                change_message="Approved via admin action"
-            )
+        self.log_bulk_change(request, queryset, "Approved via admin action")
+        
+        # Bulk updates bypass save(), so invalidate cached public pages here
+        bump_public_postings_version()
         
         self.message_user(request, f"{updated} job postings approved.")
     approve_posting.short_description = "Approve selected postings"
@@ -176,19 +197,15 @@ class JobPostingAdmin(admin.ModelAdmin):
         updated = queryset.update(
             moderation_status='REMOVED',
             moderation_date=timezone.now(),
-            moderation_by=request.user.username
+            moderation_by=request.user.username,
+            updated_at=Now()
         )
         
         # Log the action for each object
-        for obj in queryset:
-            LogEntry.objects.log_action(
-                user_id=request.user.id,
-                content_type_id=ContentType.objects.get_for_model(obj).pk,
-                object_id=obj.pk,
-                object_repr=str(obj),
-                action_flag=CHANGE,
-                change_message="Removed via admin action"
-            )
+        self.log_bulk_change(request, queryset, "Removed via admin action")
+        
+        # Bulk updates bypass save(), so invalidate cached public pages here
+        bump_public_postings_version()
         
         self.message_user(request, f"{updated} job postings removed.")
     remove_posting.short_description = "Remove selected postings"
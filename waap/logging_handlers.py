@@ -0,0 +1,24 @@
+import atexit
+import logging.handlers
+import queue
+
+
+class QueueListenerHandler(logging.handlers.QueueHandler):
+    """
+    Logging handler that hands records to a background thread.
+    
+    Request threads only put records on an in-memory queue; a QueueListener
+    thread passes them on to the configured handlers, keeping file writes
+    off the request path.
+    """
+    
+    def __init__(self, handlers):
+        super().__init__(queue.Queue(-1))
+        # Indexing the list resolves 'cfg://handlers.<name>' entries to the configured handlers
+        handlers = [handlers[i] for i in range(len(handlers))]
+        self.listener = logging.handlers.QueueListener(
+            self.queue, *handlers, respect_handler_level=True
+        )
+        self.listener.start()
+        # Flush any queued records when the process exits
+        atexit.register(self.listener.stop)
@@ -19,6 +19,7 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         # Get the dry-run flag from options
         dry_run = options['dry_run']
+        verbosity = options['verbosity']
         
         # Get current time
         now = timezone.now()
@@ -30,27 +31,31 @@ class Command(BaseCommand):
             moderation_status__in=['APPROVED', 'FLAGGED']
         )
         
-        # Count of processed postings
-        processed_count = 0
+        # Postings that still hold personal identifiers; the rest are already anonymized
+        to_anonymize = expired_postings.exclude(contact_email__isnull=True).exclude(contact_email='')
         
-        self.stdout.write(f"Found {expired_postings.count()} expired job postings")
+        if verbosity >= 1:
+            # Fetch only the fields needed for reporting, without building model instances
+            rows = list(expired_postings.values_list('id', 'job_title', 'contact_email'))
+            self.stdout.write(f"Found {len(rows)} expired job postings")
+            
+            pending_count = 0
+            for posting_id, job_title, contact_email in rows:
+                if contact_email:
+                    self.stdout.write(f"Anonymizing job posting: {job_title} (ID: {posting_id})")
+                    pending_count += 1
+                else:
+                    self.stdout.write(f"Job posting already anonymized: {job_title} (ID: {posting_id})")
+        else:
+            # Count in the database rather than loading rows nobody will see
+            self.stdout.write(f"Found {expired_postings.count()} expired job postings")
+            pending_count = None
         
-        # Process each expired posting
-        for posting in expired_postings:
-            # Check if the posting has already been anonymized
-            if posting.contact_email:
-                self.stdout.write(f"Anonymizing job posting: {posting.job_title} (ID: {posting.id})")
-                
-                if not dry_run:
-                    # Anonymize the posting by removing personal identifiers
-                    posting.contact_email = None
-                    
-                    # Save the changes
-                    posting.save()
-                
-                processed_count += 1
-            else:
-                self.stdout.write(f"Job posting already anonymized: {posting.job_title} (ID: {posting.id})")
+        if dry_run:
+            processed_count = to_anonymize.count() if pending_count is None else pending_count
+        else:
+            # Anonymize all postings by removing personal identifiers in a single UPDATE
+            processed_count = to_anonymize.update(contact_email=None, updated_at=now)
         
         # Output summary
         if dry_run:
@@ -1,39 +1,86 @@
-import json
+import os
+from operator import itemgetter
+import ijson
+import orjson
 from django.core.management.base import BaseCommand
+from django.db import connection, transaction
 from waap.models import Classification
 
+# Number of parsed classifications buffered before each insert
+BATCH_SIZE = 5000
+
+# Extracts the required fields from a classification record in one call
+get_code_and_name = itemgetter('code', 'name')
+
+# Files up to this size are parsed in one pass with orjson; larger files are streamed
+STREAM_THRESHOLD = 50 * 1024 * 1024
+
 class Command(BaseCommand):
     help = 'Import classifications from a JSON file'
 
     def add_arguments(self, parser):
         parser.add_argument('json_file', type=str, help='Path to the JSON file containing classifications')
 
+    def read_classifications(self, f):
+        """Return an iterable of classification records from a binary file."""
+        if os.fstat(f.fileno()).st_size <= STREAM_THRESHOLD:
+            return orjson.loads(f.read())
+        return ijson.items(f, 'item')
+
+    def insert_classifications(self, classifications):
+        """Insert a batch of classifications, streaming through COPY on PostgreSQL."""
+        if connection.vendor == 'postgresql':
+            # COPY has no ON CONFLICT; the batch only holds codes missing from the table
+            table = connection.ops.quote_name(Classification._meta.db_table)
+            with connection.cursor() as cursor:
+                # psycopg 3 COPY, reached through Django's cursor wrapper
+                with cursor.copy(f'COPY {table} (code, name) FROM STDIN') as copy:
+                    for classification in classifications:
+                        copy.write_row((classification.code, classification.name))
+        else:
+            Classification.objects.bulk_create(classifications, batch_size=1000, ignore_conflicts=True)
+
     def handle(self, *args, **options):
         json_file = options['json_file']
         
         try:
-            with open(json_file, 'r') as f:
-                classifications_data = json.load(f)
-            
-            # Count of classifications before import
-            initial_count = Classification.objects.count()
-            
-            # Import classifications
-            for class_data in classifications_data:
-                code = class_data.get('code')
-                name = class_data.get('name')
-                if code and name:
-                    Classification.objects.get_or_create(code=code, name=name)
+            # Run the whole import in one transaction so it commits once
+            with open(json_file, 'rb') as f, transaction.atomic():
+                # Codes that already exist, fetched once instead of querying per row
+                existing_codes = set(Classification.objects.values_list('code', flat=True))
+                new_count = 0
+                
+                # Large files are parsed incrementally so memory is bounded by the batch size
+                batch = []
+                for class_data in self.read_classifications(f):
+                    try:
+                        code, name = get_code_and_name(class_data)
+                    except KeyError:
+                        continue
+                    
+                    # Skip existing codes and duplicates within the file
+                    if code and name and code not in existing_codes:
+                        existing_codes.add(code)
+                        batch.append(Classification(code=code, name=name))
+                    
+                    if len(batch) >= BATCH_SIZE:
+                        self.insert_classifications(batch)
+                        new_count += len(batch)
+                        batch = []
+                
+                # Insert the remaining classifications
+                if batch:
+                    self.insert_classifications(batch)
+                    new_count += len(batch)
             
-            # Count of classifications after import
-            final_count = Classification.objects.count()
-            new_count = final_count - initial_count
+            # Every known code is now in the set, so it doubles as the total
+            final_count = len(existing_codes)
             
             self.stdout.write(self.style.SUCCESS(f'Successfully imported {new_count} new classifications. Total classifications: {final_count}'))
             
         except FileNotFoundError:
             self.stdout.write(self.style.ERROR(f'File not found: {json_file}'))
-        except json.JSONDecodeError:
+        except (orjson.JSONDecodeError, ijson.JSONError):
             self.stdout.write(self.style.ERROR(f'Invalid JSON format in file: {json_file}'))
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'Error importing classifications: {str(e)}'))
@@ -1,38 +1,59 @@
-import json
+import ijson
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from waap.models import Department
 
+# Number of parsed departments buffered before each insert
+BATCH_SIZE = 10000
+
 class Command(BaseCommand):
     help = 'Import departments from a JSON file'
 
     def add_arguments(self, parser):
         parser.add_argument('json_file', type=str, help='Path to the JSON file containing departments')
 
+    def insert_departments(self, departments):
+        """Insert a batch of departments; the unique name constraint guards against concurrent imports."""
+        Department.objects.bulk_create(departments, ignore_conflicts=True)
+
     def handle(self, *args, **options):
         json_file = options['json_file']
         
         try:
-            with open(json_file, 'r') as f:
-                departments_data = json.load(f)
-            
-            # Count of departments before import
-            initial_count = Department.objects.count()
-            
-            # Import departments
-            for dept_data in departments_data:
-                name = dept_data.get('name')
-                if name:
-                    Department.objects.get_or_create(name=name)
+            # Run the whole import in one transaction so it commits once
+            with open(json_file, 'rb') as f, transaction.atomic():
+                # Names that already exist, fetched once instead of querying per row
+                existing_names = set(Department.objects.values_list('name', flat=True))
+                new_count = 0
+                
+                # Parse the file incrementally so memory is bounded by the batch size
+                batch = []
+                for dept_data in ijson.items(f, 'item'):
+                    name = dept_data.get('name')
+                    
+                    # Skip existing names and duplicates within the file
+                    if name and name not in existing_names:
+                        existing_names.add(name)
+                        batch.append(Department(name=name))
+                    
+                    if len(batch) >= BATCH_SIZE:
+                        self.insert_departments(batch)
+                        new_count += len(batch)
+                        batch = []
+                
+                # Insert the remaining departments
+                if batch:
+                    self.insert_departments(batch)
+                    new_count += len(batch)
             
-            # Count of departments after import
-            final_count = Department.objects.count()
-            new_count = final_count - initial_count
+            # Every known name is now in the set, so it doubles as the total
+            final_count = len(existing_names)
             
             self.stdout.write(self.style.SUCCESS(f'Successfully imported {new_count} new departments. Total departments: {final_count}'))
             
         except FileNotFoundError:
             self.stdout.write(self.style.ERROR(f'File not found: {json_file}'))
-        except json.JSONDecodeError:
+        except ijson.JSONError:
             self.stdout.write(self.style.ERROR(f'Invalid JSON format in file: {json_file}'))
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'Error importing departments: {str(e)}'))
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 00:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('waap', '0003_jobposting_alternation_type'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['-posting_date', 'moderation_status'], name='jp_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(condition=models.Q(('moderation_status', 'APPROVED')), fields=['expiration_date'], name='jp_approved_expiry_idx'),
+        ),
+    ]
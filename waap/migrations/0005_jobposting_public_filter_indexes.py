@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 00:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('waap', '0004_jobposting_recent_and_approved_expiry_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['moderation_status', 'department', 'expiration_date'], name='jp_public_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['moderation_status', 'classification'], name='jp_mod_class_idx'),
+        ),
+    ]
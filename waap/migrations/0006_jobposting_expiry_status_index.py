@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 00:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('waap', '0005_jobposting_public_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['expiration_date', 'moderation_status'], name='jp_expiry_status_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-16 00:39
+
+import waap.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('waap', '0006_jobposting_expiry_status_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobposting',
+            name='deletion_token',
+            field=models.CharField(blank=True, default=waap.models.generate_token, max_length=100, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='onetimetoken',
+            name='expires_at',
+            field=models.DateTimeField(default=waap.models.default_token_expiry),
+        ),
+        migrations.AlterField(
+            model_name='onetimetoken',
+            name='token',
+            field=models.CharField(default=waap.models.generate_token, max_length=100, unique=True),
+        ),
+    ]
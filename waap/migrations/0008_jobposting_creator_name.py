@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-16 00:40
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Concat
+
+
+def copy_creator_names(apps, schema_editor):
+    """Fill creator_name on existing job postings from their creator."""
+    JobPosting = apps.get_model('waap', 'JobPosting')
+    WaapUser = apps.get_model('waap', 'WaapUser')
+    creator_names = WaapUser.objects.filter(pk=OuterRef('creator_id')).annotate(
+        full_name=Concat('first_name', Value(' '), 'last_name', output_field=models.CharField())
+    ).values('full_name')[:1]
+    JobPosting.objects.filter(creator__isnull=False).update(creator_name=Subquery(creator_names))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('waap', '0007_token_field_defaults'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='creator_name',
+            field=models.CharField(blank=True, max_length=201),
+        ),
+        migrations.RunPython(copy_creator_names, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 01:10
+
+import waap.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('waap', '0008_jobposting_creator_name'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobposting',
+            name='creator',
+            field=models.ForeignKey(null=True, on_delete=waap.models.set_null_and_clear_creator_name, related_name='job_postings', to='waap.waapuser'),
+        ),
+    ]
@@ -1,32 +1,38 @@
 from django.db import models
+from django.core.cache import cache
 from django.utils import timezone
 from datetime import timedelta
-import uuid
+import time
 import secrets
 import hashlib
 
+# Cache key bumped whenever the publicly visible job postings may have changed
+PUBLIC_POSTINGS_VERSION_KEY = 'waap:public_postings_version'
+
+def bump_public_postings_version():
+    """Invalidate cached public job posting pages."""
+    cache.set(PUBLIC_POSTINGS_VERSION_KEY, time.time_ns(), None)
+
+def generate_token():
+    """Return a secure random token for login and deletion links."""
+    return secrets.token_urlsafe(32)
+
+def default_token_expiry():
+    """Return the expiry time for a new one-time login token (1 hour)."""
+    return timezone.now() + timedelta(hours=1)
+
 class OneTimeToken(models.Model):
     """Model for one-time login tokens."""
-    token = models.CharField(max_length=100, unique=True)
+    # Field defaults rather than save() logic, so bulk_create() fills them in too
+    token = models.CharField(max_length=100, unique=True, default=generate_token)
     email = models.EmailField()
     created_at = models.DateTimeField(auto_now_add=True)
-    expires_at = models.DateTimeField()
+    expires_at = models.DateTimeField(default=default_token_expiry)
     is_used = models.BooleanField(default=False)
     
     def __str__(self):
         return f"Token for {self.email} ({'Used' if self.is_used else 'Active'})"
     
-    def save(self, *args, **kwargs):
-        # Generate a secure token if not provided
-        if not self.token:
-            self.token = secrets.token_urlsafe(32)
-        
-        # Set expiration time if not provided (default: 1 hour)
-        if not self.expires_at:
-            self.expires_at = timezone.now() + timedelta(hours=1)
-            
-        super().save(*args, **kwargs)
-    
     @property
     def is_valid(self):
         """Check if the token is still valid (not expired and not used)."""
@@ -34,10 +40,8 @@ class OneTimeToken(models.Model):
     
     @classmethod
     def create_for_email(cls, email):
-        """Create a new token for the given email."""
-        token = cls(email=email)
-        token.save()
-        return token
+        """Create a new token for the given email with a single INSERT."""
+        return cls.objects.create(email=email)
 
 
 class Classification(models.Model):
@@ -47,6 +51,16 @@ class Classification(models.Model):
     
     def __str__(self):
         return f"{self.code} - {self.name}"
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # The public page lists classifications in its filters
+        bump_public_postings_version()
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        bump_public_postings_version()
+        return result
 
 
 class Department(models.Model):
@@ -55,6 +69,16 @@ class Department(models.Model):
     
     def __str__(self):
         return self.name
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # The public page lists departments in its filters
+        bump_public_postings_version()
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        bump_public_postings_version()
+        return result
 
 
 class WaapUser(models.Model):
@@ -69,8 +93,33 @@ class WaapUser(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Name the row was loaded with, so save() only pushes actual renames to the job postings
+    _loaded_name = None
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_name = (instance.__dict__.get('first_name'), instance.__dict__.get('last_name'))
+        return instance
+    
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
+    
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        
+        # Keep the creator name copied onto this user's job postings in sync
+        name = (self.first_name, self.last_name)
+        if not adding and name != self._loaded_name:
+            self.job_postings.exclude(creator_name=str(self)).update(creator_name=str(self))
+        self._loaded_name = name
+
+
+def set_null_and_clear_creator_name(collector, field, sub_objs, using):
+    """on_delete for JobPosting.creator: detach the postings and drop the creator's copied name."""
+    collector.add_field_update(field, None, sub_objs)
+    collector.add_field_update(field.model._meta.get_field('creator_name'), '', sub_objs)
 
 
 class JobPosting(models.Model):
@@ -113,8 +162,10 @@ class JobPosting(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     
     # Fields for tracking the creator and deletion
-    creator = models.ForeignKey(WaapUser, on_delete=models.SET_NULL, null=True, related_name='job_postings')
-    deletion_token = models.CharField(max_length=100, unique=True, null=True, blank=True)
+    creator = models.ForeignKey(WaapUser, on_delete=set_null_and_clear_creator_name, null=True, related_name='job_postings')
+    # Copy of the creator's name for display, so listings don't need to join WaapUser
+    creator_name = models.CharField(max_length=201, blank=True)
+    deletion_token = models.CharField(max_length=100, unique=True, null=True, blank=True, default=generate_token)
     
     # Moderation fields
     moderation_status = models.CharField(
@@ -140,6 +191,33 @@ class JobPosting(models.Model):
         help_text="Username of the admin who performed the last moderation action"
     )
     
+    class Meta:
+        indexes = [
+            # Newest-first listings filtered by moderation status
+            models.Index(fields=['-posting_date', 'moderation_status'], name='jp_recent_idx'),
+            # Expiry filter of the public browse view, which only shows approved postings
+            models.Index(
+                fields=['expiration_date'],
+                condition=models.Q(moderation_status='APPROVED'),
+                name='jp_approved_expiry_idx',
+            ),
+            # Department and classification filters on the public browse view and admin;
+            # equality columns lead so the expiry range is scanned within one department
+            models.Index(fields=['moderation_status', 'department', 'expiration_date'], name='jp_public_idx'),
+            models.Index(fields=['moderation_status', 'classification'], name='jp_mod_class_idx'),
+            # expire_job_postings: expired postings that are approved or flagged
+            models.Index(fields=['expiration_date', 'moderation_status'], name='jp_expiry_status_idx'),
+        ]
+    
+    # Creator the row was loaded with, so save() can tell when the creator changes
+    _loaded_creator_id = None
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_creator_id = instance.__dict__.get('creator_id')
+        return instance
+    
     def __str__(self):
         return f"{self.job_title} - {self.department}"
     
@@ -160,11 +238,20 @@ class JobPosting(models.Model):
         if not self.expiration_date:
             self.expiration_date = timezone.now() + timedelta(days=30)
         
-        # Generate a secure deletion token if not provided
-        if not self.deletion_token:
-            self.deletion_token = secrets.token_urlsafe(32)
-            
+        # Copy the creator's name only for a new or changed creator; WaapUser.save() pushes renames
+        if self.creator_id is None:
+            self.creator_name = ''
+        elif not self.creator_name or self.creator_id != self._loaded_creator_id:
+            self.creator_name = str(self.creator)
+        
         super().save(*args, **kwargs)
+        self._loaded_creator_id = self.creator_id
+        bump_public_postings_version()
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        bump_public_postings_version()
+        return result
     
     @property
     def is_active(self):
@@ -172,6 +259,16 @@ class JobPosting(models.Model):
         return timezone.now() <= self.expiration_date
 
 
+class ContactMessageManager(models.Manager):
+    """Manager that hashes sender emails for bulk inserts, which bypass save()."""
+    
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for contact_message in objs:
+            contact_message.set_sender_email_hash()
+        return super().bulk_create(objs, *args, **kwargs)
+
+
 class ContactMessage(models.Model):
     """Model for storing contact messages with one-time email relay."""
     job_posting = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='contact_messages')
@@ -183,13 +280,17 @@ class ContactMessage(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_sent = models.BooleanField(default=False)
     
+    objects = ContactMessageManager()
+    
     def __str__(self):
         return f"Message from {self.sender_name} to {self.job_posting.job_title}"
     
-    def save(self, *args, **kwargs):
-        # Generate a hash of the sender's email if not provided
+    def set_sender_email_hash(self):
+        """Generate a hash of the sender's email if not provided."""
         if not self.sender_email_hash and self.sender_email:
             # Use SHA-256 to hash the email
             self.sender_email_hash = hashlib.sha256(self.sender_email.encode()).hexdigest()
-            
+    
+    def save(self, *args, **kwargs):
+        self.set_sender_email_hash()
         super().save(*args, **kwargs)
@@ -1,4 +1,6 @@
 from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from django.urls import reverse
 from django.utils import timezone
 from django.core import mail
@@ -8,8 +10,9 @@ from io import StringIO
 from datetime import timedelta
 from unittest.mock import patch, MagicMock
 
-from .models import WaapUser, Department, JobPosting, OneTimeToken, ContactMessage
+from .models import WaapUser, Department, Classification, JobPosting, OneTimeToken, ContactMessage
 
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
 class IntegrationTest(TestCase):
     """
     Integration tests for the WAAP application.
@@ -23,25 +26,33 @@ class IntegrationTest(TestCase):
     6. Auto-expiration functionality
     """
     
-    def setUp(self):
-        """Set up test data."""
-        # Create departments
-        self.department_it = Department.objects.create(name="Information Technology")
-        self.department_hr = Department.objects.create(name="Human Resources")
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by all tests in the class."""
+        # Create departments in a single INSERT
+        Department.objects.bulk_create([
+            Department(name="Information Technology"),
+            Department(name="Human Resources"),
+        ])
+        departments = Department.objects.in_bulk(field_name='name')
+        cls.department_it = departments["Information Technology"]
+        cls.department_hr = departments["Human Resources"]
+        cls.classification = Classification.objects.create(code="CS", name="Computer Systems")
         
         # Create admin user for moderation tests
-        self.admin_user = User.objects.create_superuser(
+        cls.admin_user = User.objects.create_superuser(
             username='admin',
             email='admin@example.com',
             password='adminpassword'
         )
         
-        # Create a client
-        self.client = Client()
-        
         # URLs for common actions
-        self.login_request_url = reverse('waap:login_request')
-        self.public_job_postings_url = reverse('waap:public_job_postings')
+        cls.login_request_url = reverse('waap:login_request')
+        cls.public_job_postings_url = reverse('waap:public_job_postings')
+        cls.job_posting_create_url = reverse('waap:job_posting_create')
+        cls.job_posting_list_url = reverse('waap:job_posting_list')
+        cls.logout_url = reverse('waap:logout')
+        cls.admin_job_posting_url = reverse('admin:waap_jobposting_changelist')
     
     def test_end_to_end_workflow(self):
         """
@@ -54,7 +65,8 @@ class IntegrationTest(TestCase):
             first_name="Test",
             last_name="User",
             email=user_email,
-            department="Information Technology"
+            department=self.department_it,
+            is_profile_completed=True
         )
         
         # Step 2: User requests a one-time login link
@@ -84,24 +96,26 @@ class IntegrationTest(TestCase):
             'job_title': 'Software Developer',
             'department': self.department_it.id,
             'location': 'Ottawa, ON',
-            'classification': 'PERMANENT',
+            'classification': self.classification.id,
+            'level': '2',
+            'alternation_type': 'SEEKING',
             'language_profile': 'BILINGUAL',
             'contact_email': user_email,
             'alternation_criteria': '{"experience": "3+ years", "skills": ["Python", "Django"]}',
         }
         
-        response = self.client.post(reverse('waap:job_posting_create'), job_posting_data)
+        response = self.client.post(self.job_posting_create_url, job_posting_data)
         self.assertEqual(response.status_code, 302)  # Redirect to job posting detail
         
         # Check that the job posting was created
         self.assertEqual(JobPosting.objects.count(), 1)
-        job_posting = JobPosting.objects.first()
+        job_posting = JobPosting.objects.order_by('id').first()
         self.assertEqual(job_posting.job_title, 'Software Developer')
         self.assertEqual(job_posting.creator, user)
         
         # Step 4: Public user browses job postings
         # First, log out the current user
-        self.client.get(reverse('waap:logout'))
+        self.client.get(self.logout_url)
         
         # Browse the public job postings page
         response = self.client.get(self.public_job_postings_url)
@@ -120,7 +134,8 @@ class IntegrationTest(TestCase):
         self.assertIn('Software Developer', data['html'])
         
         # Step 5: Public user contacts the job posting owner
-        with patch('captcha.fields.ReCaptchaField.clean') as mock_clean:
+        mail.outbox.clear()
+        with patch('django_recaptcha.fields.ReCaptchaField.clean') as mock_clean:
             # Mock the CAPTCHA validation to pass
             mock_clean.return_value = 'PASSED'
             
@@ -137,8 +152,8 @@ class IntegrationTest(TestCase):
         
         # Check that a contact message was created and an email was sent
         self.assertEqual(ContactMessage.objects.count(), 1)
-        self.assertEqual(len(mail.outbox), 2)  # First email was for login
-        self.assertEqual(mail.outbox[1].to, [user_email])
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [user_email])
         
         # Step 6: User logs back in and requests deletion of their job posting
         # First, create a new token for the user
@@ -149,13 +164,14 @@ class IntegrationTest(TestCase):
         self.client.get(verify_url)
         
         # User requests deletion
+        mail.outbox.clear()
         response = self.client.post(reverse('waap:job_posting_delete_request', kwargs={'pk': job_posting.id}))
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'waap/job_posting_delete_request_success.html')
         
         # Check that a deletion email was sent
-        self.assertEqual(len(mail.outbox), 3)
-        self.assertEqual(mail.outbox[2].to, [user_email])
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [user_email])
         
         # Extract the deletion token from the job posting
         job_posting.refresh_from_db()
@@ -169,6 +185,101 @@ class IntegrationTest(TestCase):
         # Check that the job posting was deleted
         self.assertEqual(JobPosting.objects.count(), 0)
 
+    def test_each_notification_step_sends_one_email(self):
+        """
+        Test that each step that notifies the job posting owner sends exactly one email,
+        independently of the steps before it.
+        """
+        user_email = "test.user@government.ca"
+        user = WaapUser.objects.create(
+            first_name="Test",
+            last_name="User",
+            email=user_email,
+            department=self.department_it,
+            is_profile_completed=True
+        )
+        job_posting = JobPosting.objects.create(
+            job_title='Software Developer',
+            department=self.department_it,
+            location='Ottawa, ON',
+            classification=self.classification,
+            level=2,
+            language_profile='BILINGUAL',
+            contact_email=user_email,
+            creator=user,
+            expiration_date=timezone.now() + timedelta(days=30),
+            moderation_status='APPROVED'
+        )
+        contact_data = {
+            'sender_name': 'John Doe',
+            'sender_email': 'john.doe@example.com',
+            'message': 'I am interested in this position. Please contact me.',
+            'captcha': 'PASSED',
+        }
+        
+        # (step, URL, POST data, whether the owner must be logged in)
+        steps = [
+            ('login request', self.login_request_url, {'email': user_email}, False),
+            ('contact form', reverse('waap:contact_form', kwargs={'pk': job_posting.id}), contact_data, False),
+            ('deletion request', reverse('waap:job_posting_delete_request', kwargs={'pk': job_posting.id}), {}, True),
+        ]
+        
+        for step, url, data, requires_login in steps:
+            with self.subTest(step=step):
+                client = Client()
+                if requires_login:
+                    token = OneTimeToken.create_for_email(user_email)
+                    client.get(reverse('waap:login_verify', kwargs={'token': token.token}))
+                
+                mail.outbox.clear()
+                with patch('django_recaptcha.fields.ReCaptchaField.clean', return_value='PASSED'):
+                    response = client.post(url, data)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(mail.outbox), 1)
+                self.assertEqual(mail.outbox[0].to, [user_email])
+
+    def test_job_posting_list_query_count_independent_of_postings(self):
+        """
+        Test that the job posting list runs the same number of queries however
+        many postings it shows. The public page, its AJAX filter and the admin
+        changelist have their own query count tests in tests.py and tests_admin.py.
+        """
+        user = WaapUser.objects.create(
+            first_name="Test",
+            last_name="User",
+            email="test.user@government.ca",
+            department=self.department_it,
+            is_profile_completed=True
+        )
+        
+        def create_postings(count):
+            JobPosting.objects.bulk_create([
+                JobPosting(
+                    job_title=f"Position {i}",
+                    department=department,
+                    location='Ottawa, ON',
+                    classification=self.classification,
+                    level=2,
+                    language_profile='BILINGUAL',
+                    contact_email=user.email,
+                    creator=user,
+                    expiration_date=timezone.now() + timedelta(days=30),
+                    moderation_status='APPROVED'
+                )
+                for i, department in enumerate([self.department_it, self.department_hr] * count)
+            ])
+        
+        create_postings(1)
+        with CaptureQueriesContext(connection) as initial_queries:
+            response = self.client.get(self.job_posting_list_url)
+        self.assertEqual(response.status_code, 200)
+        
+        create_postings(5)
+        with CaptureQueriesContext(connection) as expanded_queries:
+            response = self.client.get(self.job_posting_list_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(expanded_queries), len(initial_queries))
+
     def test_admin_moderation_workflow(self):
         """
         Test the admin moderation workflow.
@@ -178,7 +289,8 @@ class IntegrationTest(TestCase):
             first_name="Test",
             last_name="User",
             email="test.user@government.ca",
-            department="Information Technology"
+            department=self.department_it,
+            is_profile_completed=True
         )
         
         # Create a job posting
@@ -186,7 +298,8 @@ class IntegrationTest(TestCase):
             job_title='Software Developer',
             department=self.department_it,
             location='Ottawa, ON',
-            classification='PERMANENT',
+            classification=self.classification,
+            level=2,
             language_profile='BILINGUAL',
             contact_email='test.user@government.ca',
             creator=user,
@@ -196,15 +309,14 @@ class IntegrationTest(TestCase):
         
         # Log in as admin
         admin_client = Client()
-        admin_client.login(username='admin', password='adminpassword')
+        admin_client.force_login(self.admin_user)
         
         # Flag the job posting for review
-        admin_url = reverse('admin:waap_jobposting_changelist')
         data = {
             'action': 'flag_for_review',
             '_selected_action': [job_posting.id]
         }
-        response = admin_client.post(admin_url, data, follow=True)
+        response = admin_client.post(self.admin_job_posting_url, data, follow=True)
         self.assertEqual(response.status_code, 200)
         
         # Check that the job posting was flagged
@@ -226,7 +338,7 @@ class IntegrationTest(TestCase):
             'action': 'approve_posting',
             '_selected_action': [job_posting.id]
         }
-        response = admin_client.post(admin_url, data, follow=True)
+        response = admin_client.post(self.admin_job_posting_url, data, follow=True)
         self.assertEqual(response.status_code, 200)
         
         # Check that the job posting was approved
@@ -247,7 +359,8 @@ class IntegrationTest(TestCase):
             first_name="Test",
             last_name="User",
             email="test.user@government.ca",
-            department="Information Technology"
+            department=self.department_it,
+            is_profile_completed=True
         )
         
         # Create an active job posting
@@ -255,7 +368,8 @@ class IntegrationTest(TestCase):
             job_title="Active Position",
             department=self.department_it,
             location="Ottawa, ON",
-            classification="PERMANENT",
+            classification=self.classification,
+            level=2,
             language_profile="BILINGUAL",
             contact_email="active@example.ca",
             creator=user,
@@ -267,7 +381,8 @@ class IntegrationTest(TestCase):
             job_title="Expired Position",
             department=self.department_it,
             location="Toronto, ON",
-            classification="CONTRACT",
+            classification=self.classification,
+            level=3,
             language_profile="ENGLISH",
             contact_email="expired@example.ca",
             creator=user,
@@ -307,7 +422,8 @@ class IntegrationTest(TestCase):
             first_name="Test",
             last_name="User",
             email=user_email,
-            department="Information Technology"
+            department=self.department_it,
+            is_profile_completed=True
         )
         
         # Create a token and log in
@@ -320,27 +436,29 @@ class IntegrationTest(TestCase):
             'job_title': 'Software Developer',
             'department': self.department_it.id,
             'location': 'Ottawa, ON',
-            'classification': 'PERMANENT',
+            'classification': self.classification.id,
+            'level': '2',
+            'alternation_type': 'SEEKING',
             'language_profile': 'BILINGUAL',
             'contact_email': user_email,
             'alternation_criteria': '{"experience": "3+ years", "skills": ["Python", "Django"]}',
         }
         
-        self.client.post(reverse('waap:job_posting_create'), job_posting_data)
-        job_posting = JobPosting.objects.first()
+        self.client.post(self.job_posting_create_url, job_posting_data)
+        job_posting = JobPosting.objects.order_by('id').first()
+        contact_url = reverse('waap:contact_form', kwargs={'pk': job_posting.id})
         
         # Step 3: Admin flags the job posting for review
         admin_client = Client()
-        admin_client.login(username='admin', password='adminpassword')
-        admin_url = reverse('admin:waap_jobposting_changelist')
+        admin_client.force_login(self.admin_user)
         data = {
             'action': 'flag_for_review',
             '_selected_action': [job_posting.id]
         }
-        admin_client.post(admin_url, data, follow=True)
+        admin_client.post(self.admin_job_posting_url, data, follow=True)
         
         # Step 4: Public user tries to contact but gets an error
-        with patch('captcha.fields.ReCaptchaField.clean') as mock_clean:
+        with patch('django_recaptcha.fields.ReCaptchaField.clean') as mock_clean:
             mock_clean.return_value = 'PASSED'
             
             contact_data = {
@@ -350,7 +468,7 @@ class IntegrationTest(TestCase):
                 'captcha': 'PASSED',
             }
             
-            response = self.client.get(reverse('waap:contact_form', kwargs={'pk': job_posting.id}))
+            response = self.client.get(contact_url)
             self.assertContains(response, 'This job posting is currently under review')
         
         # Step 5: Admin approves the job posting
@@ -358,13 +476,13 @@ class IntegrationTest(TestCase):
             'action': 'approve_posting',
             '_selected_action': [job_posting.id]
         }
-        admin_client.post(admin_url, data, follow=True)
+        admin_client.post(self.admin_job_posting_url, data, follow=True)
         
         # Step 6: Public user successfully contacts the job posting owner
-        with patch('captcha.fields.ReCaptchaField.clean') as mock_clean:
+        with patch('django_recaptcha.fields.ReCaptchaField.clean') as mock_clean:
             mock_clean.return_value = 'PASSED'
             
-            response = self.client.post(reverse('waap:contact_form', kwargs={'pk': job_posting.id}), contact_data)
+            response = self.client.post(contact_url, contact_data)
             self.assertTemplateUsed(response, 'waap/contact_success.html')
         
         # Step 7: Set the job posting as expired
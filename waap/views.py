@@ -8,14 +8,20 @@ from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from django.conf import settings
-from django.views.decorators.http import require_http_methods
-from django.db.models import Q
+from django.views.decorators.http import require_http_methods, etag
+from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_headers
+from django.utils.decorators import method_decorator
+from django.core.cache import cache
+from django.db.models import Q, Max, Count
 
-from .models import WaapUser, OneTimeToken, Department, JobPosting, ContactMessage, Classification
+from .models import (
+    WaapUser, OneTimeToken, Department, JobPosting, ContactMessage, Classification,
+    PUBLIC_POSTINGS_VERSION_KEY, generate_token,
+)
 from .forms import ContactForm
 import re
 import json
-import secrets
 from datetime import datetime, timedelta
 
 def index(request):
@@ -140,9 +146,11 @@ def login_verify(request, token):
             'error_message': error_message
         })
     
-    # Mark the token as used
-    token_obj.is_used = True
-    token_obj.save()
+    # Mark the token as used; filtering on is_used keeps concurrent verifications single-use
+    if not OneTimeToken.objects.filter(pk=token_obj.pk, is_used=False).update(is_used=True):
+        return render(request, 'waap/login_error.html', {
+            'error_message': 'This login link has already been used.'
+        })
     
     # Find or create the user
     try:
@@ -551,13 +559,13 @@ def job_posting_detail(request, pk):
 def job_posting_delete_request(request, pk):
     """View for requesting a deletion link for a job posting."""
     # Get the job posting
-    job_posting = get_object_or_404(JobPosting, pk=pk)
+    job_posting = get_object_or_404(JobPosting.objects.select_related('department'), pk=pk)
     
     # Get the authenticated user
     user = get_authenticated_user(request)
     
-    # Check if the user is the creator of the job posting
-    if not user or not job_posting.creator or user.id != job_posting.creator.id:
+    # Check if the user is the creator of the job posting, comparing IDs so the creator isn't fetched
+    if not user or job_posting.creator_id != user.id:
         return render(request, 'waap/job_posting_delete_request.html', {
             'error_message': 'You are not authorized to delete this job posting.',
             'job_posting': job_posting,
@@ -566,7 +574,7 @@ def job_posting_delete_request(request, pk):
     
     if request.method == 'POST':
         # Generate a new deletion token
-        job_posting.deletion_token = secrets.token_urlsafe(32)
+        job_posting.deletion_token = generate_token()
         job_posting.save()
         
         # Send the deletion email
@@ -634,12 +642,46 @@ class JobPostingListView(ListView):
     
     def get_queryset(self):
         """Return only active job postings."""
-        return JobPosting.objects.filter(expiration_date__gte=timezone.now()).order_by('-posting_date')
+        return JobPosting.objects.filter(
+            expiration_date__gte=timezone.now()
+        ).select_related('department', 'classification').order_by('-posting_date')
+
+
+# Seconds a rendered public job postings response is served from the cache
+PUBLIC_POSTINGS_CACHE_SECONDS = 60
 
+def public_postings_etag(request, *args, **kwargs):
+    """Return an ETag for the public job postings page, computed once per request."""
+    if not hasattr(request, '_public_postings_etag'):
+        # Count and latest update of the visible postings catch changes the version key misses, such as expiry
+        stats = JobPosting.objects.filter(
+            expiration_date__gte=timezone.now(),
+            moderation_status='APPROVED'
+        ).aggregate(last_updated=Max('updated_at'), total=Count('id'))
+        last_updated = stats['last_updated'].timestamp() if stats['last_updated'] else 0
+        version = cache.get(PUBLIC_POSTINGS_VERSION_KEY, 0)
+        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            variant = 'ajax'
+        else:
+            # Only the full page lists departments and classifications in its filters; the counts
+            # catch bulk inserts and deletes that skip the models' version bump
+            variant = f"page-{Department.objects.count()}-{Classification.objects.count()}"
+        # The navigation differs for logged-in users, so they never share a cached page or ETag with anonymous ones
+        auth_state = 'auth' if is_authenticated(request) else 'anon'
+        request._public_postings_etag = f"{version}-{stats['total']}-{last_updated}-{variant}-{auth_state}"
+    return request._public_postings_etag
 
+@method_decorator(etag(public_postings_etag), name='dispatch')
 class PublicJobPostingView(View):
     """Public view for browsing and filtering job postings."""
     
+    def dispatch(self, request, *args, **kwargs):
+        """Serve repeat requests from the cache, keyed on the current postings ETag and login state."""
+        # The AJAX filter and the full page share a URL, so cache them separately
+        view = vary_on_headers('X-Requested-With')(super().dispatch)
+        key_prefix = f"public_postings_{public_postings_etag(request)}"
+        return cache_page(PUBLIC_POSTINGS_CACHE_SECONDS, key_prefix=key_prefix)(view)(request, *args, **kwargs)
+    
     def get(self, request):
         """Handle GET requests for the public job posting view."""
         # Check if this is an AJAX request for filtering
@@ -649,30 +691,40 @@ class PublicJobPostingView(View):
         # Regular page load
         return self.render_public_page(request)
     
+    def get_queryset(self):
+        """Return active, approved job postings with the related rows the templates display."""
+        return JobPosting.objects.filter(
+            expiration_date__gte=timezone.now(),
+            moderation_status='APPROVED'
+        ).select_related('department', 'classification')
+    
     def render_public_page(self, request):
         """Render the public job posting page with initial data."""
         # Get active job postings that are approved (not flagged, inappropriate, or removed)
-        job_postings = JobPosting.objects.filter(
-            expiration_date__gte=timezone.now(),
-            moderation_status='APPROVED'
-        ).order_by('-posting_date')
+        job_postings = self.get_queryset().order_by('-posting_date')
         
         # Get filter options
         departments = Department.objects.all().order_by('name')
         classifications = Classification.objects.all().order_by('code')
         
         # Get all unique classification-level combinations from active job postings
-        classification_levels = []
+        # Keyed by display string, so each posting is formatted once and de-duplicated in constant time
+        classification_levels_by_display = {}
         for posting in job_postings:
-            if posting.formatted_classification and posting.formatted_classification not in [cl['display'] for cl in classification_levels]:
-                classification_levels.append({
+            display = posting.formatted_classification
+            if display and display not in classification_levels_by_display:
+                classification_levels_by_display[display] = {
                     'classification_id': posting.classification.id,
+                    'code': posting.classification.code,
                     'level': posting.level,
-                    'display': posting.formatted_classification
-                })
+                    'display': display
+                }
         
-        # Sort by classification code and level
-        classification_levels.sort(key=lambda x: (x['display'].split('-')[0], int(x['display'].split('-')[1]) if x['display'].split('-')[1] != 'DEV' else 0))
+        # Sort by classification code and level (DEV is level 0)
+        classification_levels = sorted(
+            classification_levels_by_display.values(),
+            key=lambda x: (x['code'], x['level'])
+        )
         
         # Canadian provinces and territories, plus National Capital Region and International
         locations = [
@@ -718,10 +770,7 @@ class PublicJobPostingView(View):
         view_mode = request.GET.get('view_mode', 'card')
         
         # Start with all active job postings that are approved
-        queryset = JobPosting.objects.filter(
-            expiration_date__gte=timezone.now(),
-            moderation_status='APPROVED'
-        )
+        queryset = self.get_queryset()
         
         # Apply filters
         if department_id:
@@ -835,7 +884,7 @@ def send_contact_email(request, contact_message):
 def contact_form(request, pk):
     """View for the contact form."""
     # Get the job posting
-    job_posting = get_object_or_404(JobPosting, pk=pk)
+    job_posting = get_object_or_404(JobPosting.objects.select_related('department'), pk=pk)
     
     # Check if the job posting is active and approved
     if not job_posting.is_active:
@@ -91,6 +91,12 @@ DATABASES = {
     }
 }
 
+# Local credentials written by setup_db.py override the defaults above
+try:
+    from .local_db import DATABASES
+except ImportError:
+    pass
+
 
 
 # Password validation
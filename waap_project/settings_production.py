@@ -40,13 +40,57 @@ DATABASES = {
         'PASSWORD': os.environ.get('DB_PASSWORD', ''),
         'HOST': os.environ.get('DB_HOST', 'localhost'),
         'PORT': os.environ.get('DB_PORT', '5432'),
-        'CONN_MAX_AGE': 600,  # 10 minutes
+        'OPTIONS': {
+            # psycopg 3 connection pool; replaces persistent connections (CONN_MAX_AGE)
+            'pool': {
+                'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 4)),
+                'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 20)),
+            },
+            # Bind query parameters server-side so PostgreSQL can reuse prepared plans
+            'server_side_binding': True,
+        },
+    }
+}
+
+# Cache shared by all gunicorn workers, so a public postings version bump in one worker
+# invalidates the cached pages and ETags served by the others. Create the table with:
+#   python manage.py createcachetable --settings=waap_project.settings_production
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'waap_cache',
     }
 }
 
 # Static files (CSS, JavaScript, Images)
 STATIC_ROOT = BASE_DIR / 'staticfiles'
-STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'
+# WhiteNoise serves the hashed files with pre-compressed gzip/brotli variants built by collectstatic
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# Serve static files from WhiteNoise, directly after SecurityMiddleware
+MIDDLEWARE = list(MIDDLEWARE)
+MIDDLEWARE.insert(
+    MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1,
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+)
+
+# Compress dynamic responses and answer conditional GETs with 304s; WhiteNoise
+# already serves pre-compressed static files, so these sit just after it
+MIDDLEWARE.insert(
+    MIDDLEWARE.index('whitenoise.middleware.WhiteNoiseMiddleware') + 1,
+    'django.middleware.gzip.GZipMiddleware',
+)
+MIDDLEWARE.insert(
+    MIDDLEWARE.index('django.middleware.gzip.GZipMiddleware') + 1,
+    'django.middleware.http.ConditionalGetMiddleware',
+)
 
 # reCAPTCHA settings
 # In production, these should be set as environment variables with real keys
@@ -60,6 +104,7 @@ EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 587))
 EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'True') == 'True'
 EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_TIMEOUT = int(os.environ.get('EMAIL_TIMEOUT', 5))  # Seconds before a stalled SMTP call fails the request
 DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'noreply@waap.gov.ca')
 
 # Logging configuration
@@ -88,15 +133,20 @@ LOGGING = {
             'class': 'logging.StreamHandler',
             'formatter': 'simple',
         },
+        # Loggers write to this queue; a background thread forwards records to the file and console
+        'queue': {
+            '()': 'waap.logging_handlers.QueueListenerHandler',
+            'handlers': ['cfg://handlers.file', 'cfg://handlers.console'],
+        },
     },
     'loggers': {
         'django': {
-            'handlers': ['file', 'console'],
+            'handlers': ['queue'],
             'level': 'INFO',
             'propagate': True,
         },
         'waap': {
-            'handlers': ['file', 'console'],
+            'handlers': ['queue'],
             'level': 'INFO',
             'propagate': True,
         },
@@ -0,0 +1,38 @@
+"""
+Test settings for waap_project.
+
+This file contains settings that speed up the test suite.
+It imports the base settings and overrides settings that need to be different for tests.
+
+Usage:
+    python manage.py test --parallel=auto --settings=waap_project.settings_test
+"""
+
+from .settings import *  # Import base settings
+
+# In-memory SQLite avoids PostgreSQL setup/teardown and lets --parallel clone databases cheaply
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+# Password hashing is deliberately slow; tests don't need it to be secure
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+
+class DisableMigrations:
+    """Migration module mapping that disables migrations for every app."""
+
+    def __contains__(self, item):
+        return True
+
+    def __getitem__(self, item):
+        return None
+
+
+# Build the test schema straight from the models instead of replaying every migration
+MIGRATION_MODULES = DisableMigrations()